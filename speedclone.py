@@ -1,23 +1,88 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import argparse, io, json, os, re, sys, tarfile, zipfile, time
+import argparse, json, os, queue, re, shutil, struct, sys, tarfile, tempfile, threading, zipfile, time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from urllib.parse import urlparse, urlencode
-from urllib.request import Request, urlopen
+import urllib3
 from rich import print
+try:
+    from isal import isal_zlib as _zlib
+except ImportError:
+    import zlib as _zlib
 
 VERSION = "1.0"
 UA = f"speedclone/{VERSION}"
+COPY_BUFSIZE = 1 << 21
+SPOOL_MAX = 128 << 20
+INFLATE_CHUNK = 1 << 18
+INFLATE_MAX = INFLATE_CHUNK * 4
+ZIP_LOCAL_MAGIC = b"PK\x03\x04"
+ZIP_LOCAL_HEADER = 30
+PREFETCH_CHUNK = 1 << 20
+PREFETCH_DEPTH = 8
+_SHA_HREF = re.compile(rb'href="/([^/"]+)/([^/"]+)/commit/([0-9a-f]{40})"', re.I)
+_SHA_TEASE = re.compile(rb'data-test-selector="commit-tease-sha".*?>([0-9a-f]{7,40})<', re.I|re.S)
+WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+API_RETRIES = 3
+_POOL = urllib3.PoolManager(maxsize=8, retries=urllib3.Retry(connect=0, read=0, other=0, redirect=5), headers={"User-Agent": UA})
 
-def _http(url, accept=None, token=None):
+class _HTTPError(RuntimeError):
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+
+class _NotModified(Exception):
+    pass
+
+@contextmanager
+def _http(url, accept=None, token=None, etag=None):
     h = {"User-Agent": UA}
     if accept: h["Accept"] = accept
     if token: h["Authorization"] = f"Bearer {token}"
-    return urlopen(Request(url, headers=h))
+    if etag: h["If-None-Match"] = etag
+    r = _POOL.request("GET", url, headers=h, preload_content=False)
+    if r.status >= 400:
+        r.drain_conn()
+        r.release_conn()
+        raise _HTTPError(r.status, url)
+    try:
+        yield r
+        r.drain_conn()
+    except BaseException:
+        r.close()
+        raise
+    finally:
+        r.release_conn()
+
+def _json(url, token=None, etag=None):
+    for i in range(API_RETRIES):
+        try:
+            with _http(url, "application/vnd.github+json", token, etag) as r:
+                if r.status == 304: raise _NotModified(url)
+                return json.loads(r.read()), r.headers.get("ETag")
+        except (urllib3.exceptions.HTTPError, _HTTPError) as e:
+            if i == API_RETRIES - 1 or getattr(e, "status", 500) < 500: raise
+            time.sleep(0.5 * 2 ** i)
 
-def _json(url, token=None):
-    with _http(url, "application/vnd.github+json", token) as r:
-        return json.loads(r.read().decode("utf-8"))
+def _cache_path():
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "speedclone" / "api.json"
+
+def _load_cache():
+    try:
+        cache = json.loads(_cache_path().read_bytes())
+    except Exception:
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _save_cache(cache):
+    try:
+        path = _cache_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cache), encoding="utf-8")
+    except (OSError, RuntimeError):
+        pass
 
 def _read(url):
     with _http(url) as r:
@@ -34,143 +99,294 @@ def _owner_repo(url: str):
 
 def _guess_default_sha_html(owner, repo, branch_hint=None):
     def scrape(path):
-        html = _read(f"https://github.com/{owner}/{repo}/{path}").decode("utf-8","ignore")
-        return html
+        return _read(f"https://github.com/{owner}/{repo}/{path}")
+    owner_b, repo_b = owner.lower().encode(), repo.lower().encode()
     for b in ([branch_hint] if branch_hint else []) + ["main","master"]:
         try:
             html = scrape(f"commits/{b}")
-            m = re.search(rf'href="/{re.escape(owner)}/{re.escape(repo)}/commit/([0-9a-f]{{40}})"', html, re.I)
-            if m: return b, m.group(1)
+            for m in _SHA_HREF.finditer(html):
+                if m.group(1).lower() == owner_b and m.group(2).lower() == repo_b:
+                    return b, m.group(3).decode("ascii")
         except Exception:
             pass
     for b in ([branch_hint] if branch_hint else []) + ["main","master"]:
         try:
             html = scrape(f"tree/{b}")
-            m = re.search(r'data-test-selector="commit-tease-sha".*?>([0-9a-f]{7,40})<', html, re.I|re.S)
-            if m: return b, m.group(1)
+            m = _SHA_TEASE.search(html)
+            if m: return b, m.group(1).decode("ascii")
         except Exception:
             pass
     raise RuntimeError("HTMLから最新SHAを取得できませんでした。")
 
-def _is_within(base: Path, target: Path) -> bool:
+def _write_file(out: str, data, mode: int):
+    with open(out, "wb") as f:
+        if isinstance(data, bytes): f.write(data)
+        else: shutil.copyfileobj(data, f, COPY_BUFSIZE)
+        if mode:
+            try:
+                os.fchmod(f.fileno(), mode)
+            except Exception:
+                pass
+
+class _WritePool:
+    def __init__(self):
+        self.ex = ThreadPoolExecutor(max_workers=WRITE_WORKERS)
+        self.slots = threading.BoundedSemaphore(WRITE_WORKERS * 2)
+        self.errs = []
+
+    def submit(self, fn, *args):
+        if self.errs: raise self.errs[0]
+        self.slots.acquire()
+        self.ex.submit(fn, *args).add_done_callback(self._done)
+
+    def _done(self, fut):
+        if fut.exception(): self.errs.append(fut.exception())
+        self.slots.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.ex.shutdown(wait=True)
+        if self.errs and exc[0] is None: raise self.errs[0]
+
+def _write_range(out: str, src_fd: int, offset: int, size: int, mode: int):
+    with open(out, "wb") as f:
+        dst_fd = f.fileno()
+        while size:
+            try:
+                n = os.copy_file_range(src_fd, dst_fd, size, offset)
+            except OSError:
+                n = os.sendfile(dst_fd, src_fd, offset, size)
+            if not n: raise RuntimeError("zipの解凍時にエラー: データが途中で終わっています。")
+            offset += n; size -= n
+        if mode:
+            try:
+                os.fchmod(dst_fd, mode)
+            except Exception:
+                pass
+
+def _file_fd(fp):
+    if not hasattr(os, "copy_file_range"): return None
+    try:
+        return fp.fileno()
+    except Exception:
+        return None
+
+def _zip_data_offset(fd: int, info: zipfile.ZipInfo) -> int:
+    h = os.pread(fd, ZIP_LOCAL_HEADER, info.header_offset)
+    if h[:4] != ZIP_LOCAL_MAGIC: raise zipfile.BadZipFile(f"ローカルヘッダが不正です: {info.filename}")
+    name_len, extra_len = struct.unpack("<HH", h[26:30])
+    return info.header_offset + ZIP_LOCAL_HEADER + name_len + extra_len
+
+class _ChunkReader:
+    def __init__(self, next_chunk):
+        self.next_chunk = next_chunk
+        self.buf = b""
+        self.pos = 0
+        self.eof = False
+
+    def read(self, n=-1):
+        while (n < 0 or len(self.buf) - self.pos < n) and not self.eof:
+            self.buf = self.buf[self.pos:] + self.next_chunk()
+            self.pos = 0
+        end = len(self.buf) if n < 0 else self.pos + n
+        out = self.buf[self.pos:end]
+        self.pos = min(end, len(self.buf))
+        return out
+
+class _Gunzip(_ChunkReader):
+    def __init__(self, fp):
+        super().__init__(self._next)
+        self.fp = fp
+        self.z = _zlib.decompressobj(16 + _zlib.MAX_WBITS)
+
+    def _next(self):
+        data = self.z.unconsumed_tail or self.fp.read(INFLATE_CHUNK)
+        out = self.z.decompress(data, INFLATE_MAX)
+        self.eof = self.z.eof
+        if not data and not out and not self.eof: raise EOFError("gzipストリームが途中で終わっています。")
+        return out
+
+class _Prefetch(_ChunkReader):
+    def __init__(self, fp):
+        super().__init__(self._next)
+        self.q = queue.Queue(maxsize=PREFETCH_DEPTH)
+        self.stop = threading.Event()
+        self.t = threading.Thread(target=self._run, args=(fp,), daemon=True)
+        self.t.start()
+
+    def _run(self, fp):
+        try:
+            while not self.stop.is_set():
+                chunk = fp.read(PREFETCH_CHUNK)
+                self.q.put(chunk)
+                if not chunk: return
+        except BaseException as e:
+            self.q.put(e)
+
+    def _next(self):
+        item = self.q.get()
+        if isinstance(item, BaseException):
+            self.eof = True
+            raise item
+        if not item: self.eof = True
+        return item
+
+    def close(self):
+        self.stop.set()
+        while self.t.is_alive():
+            try:
+                self.q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _spool(resp, abort=None):
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX)
     try:
-        base = base.resolve(strict=False)
-        target = target.resolve(strict=False)
-        return str(target).startswith(str(base) + os.sep)
+        while chunk := resp.read1(COPY_BUFSIZE):
+            if abort is not None and abort.is_set(): raise RuntimeError("ダウンロードが中断されました。")
+            spool.write(chunk)
+        if not spool.tell(): raise RuntimeError("空の応答が返されました。")
     except Exception:
-        return False
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
 
-def _download_tar_stream(url: str, dst: Path):
+def _fetch_spool(url: str, abort=None):
     with _http(url) as resp:
-        with tarfile.open(fileobj=resp, mode="r|gz") as tf:
-            _extract_tar_to(tf, dst)
+        if int(resp.headers.get("Content-Length") or 0) > SPOOL_MAX:
+            resp.close()
+            return None
+        return _spool(resp, abort)
+
+def _extract_spool(spool, dst: Path):
+    magic = spool.read(2)
+    spool.seek(0)
+    if magic == b"\x1f\x8b":
+        with _Prefetch(_Gunzip(spool)) as src, tarfile.open(fileobj=src, mode="r|") as tf:
+            _extract_tar_to(tf, dst); return
+    on_disk = spool.seek(0, os.SEEK_END) > SPOOL_MAX
+    spool.seek(0)
+    with zipfile.ZipFile(spool) as zf:
+        _extract_zip_to(zf, dst, on_disk)
 
 def _extract_tar_to(tf: tarfile.TarFile, dst: Path):
+    base = str(dst.resolve(strict=False)) + os.sep
+    made = set()
     prefix = None
-    for m in tf.getmembers():
-        if m.isdir():
-            prefix = m.name.rstrip('/') + '/'
-            break
+    with _WritePool() as pool:
+        for m in tf:
+            if prefix is None:
+                prefix = m.name.split('/',1)[0] + '/'
+            if not m.name.startswith(prefix): continue
+            rel = m.name[len(prefix):]
+            if not rel: continue
+            out = os.path.normpath(base + rel)
+            if not out.startswith(base):
+                continue
+            t = m.type
+            if t == tarfile.DIRTYPE:
+                os.makedirs(out, exist_ok=True)
+                made.add(out)
+            elif t in tarfile.REGULAR_TYPES:
+                parent = os.path.dirname(out)
+                if parent not in made:
+                    os.makedirs(parent, exist_ok=True)
+                    made.add(parent)
+                src = tf.extractfile(m)
+                if src is None: continue
+                with src:
+                    if m.size <= COPY_BUFSIZE:
+                        pool.submit(_write_file, out, src.read(), m.mode & 0o777)
+                    else:
+                        _write_file(out, src, m.mode & 0o777)
     if prefix is None: raise RuntimeError("tarの解凍時にエラー: 構造が不正です。")
-    for m in tf.getmembers():
-        
-        if not m.name.startswith(prefix): continue
-        rel = m.name[len(prefix):]
-        if not rel: continue
-        out = dst / rel
-        if not _is_within(dst, out):
-            continue
-        if m.issym() or m.islnk():
-            continue
-        if m.isdir():
-            out.mkdir(parents=True, exist_ok=True)
-        elif m.isfile():
-            out.parent.mkdir(parents=True, exist_ok=True)
-            src = tf.extractfile(m)
-            if src is None: continue
-            with src, open(out, "wb") as f:
-                f.write(src.read())
-            try:
-                os.chmod(out, m.mode & 0o777)
-            except Exception:
-                pass
 
-def _extract_zip_to(zf: zipfile.ZipFile, dst: Path):
-    roots = sorted({name.split('/',1)[0]+'/' for name in zf.namelist() if '/' in name})
+def _extract_zip_to(zf: zipfile.ZipFile, dst: Path, on_disk: bool = False):
+    infos = zf.infolist()
+    roots = sorted({i.filename.split('/',1)[0]+'/' for i in infos if '/' in i.filename})
     prefix = roots[0] if roots else ''
-    for name in zf.namelist():
+    base = str(dst.resolve(strict=False)) + os.sep
+    dirs, files = set(), []
+    for info in infos:
+        name = info.filename
         if prefix and not name.startswith(prefix):
             continue
         rel = name[len(prefix):]
         if not rel:
             continue
-        out = (dst / rel).resolve(strict=False)
+        out = os.path.normpath(base + rel)
 
-        if not _is_within(dst, out):
+        if not out.startswith(base):
             continue
 
         if name.endswith('/'):
-            out.mkdir(parents=True, exist_ok=True)
+            dirs.add(out)
         else:
-            out.parent.mkdir(parents=True, exist_ok=True)
-            with zf.open(name) as src, open(out,"wb") as f:
-                f.write(src.read())
-            try:
-                info = zf.getinfo(name)
-                perm = (info.external_attr >> 16) & 0o777
-                if perm:
-                    os.chmod(out, perm)
-            except Exception:
-                pass
+            dirs.add(os.path.dirname(out))
+            files.append((info, out))
+    for d in sorted(dirs):
+        os.makedirs(d, exist_ok=True)
+    # codeloadのzipは通常deflate圧縮のため、このゼロコピー経路はディスクに溢れたzipフォールバック内のstoredメンバーでしか使われない
+    fd = _file_fd(zf.fp) if on_disk else None
+    with _WritePool() as pool:
+        for info, out in files:
+            perm = (info.external_attr >> 16) & 0o777
+            if fd is not None and info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+                pool.submit(_write_range, out, fd, _zip_data_offset(fd, info), info.file_size, perm)
+                continue
+            with zf.open(info) as src:
+                if info.file_size <= COPY_BUFSIZE:
+                    pool.submit(_write_file, out, src.read(), perm)
+                else:
+                    _write_file(out, src, perm)
 
-def _download_snapshot(dst: Path, owner: str, repo: str, ref_sha: str, branch_name: str):
-    errs = []
-    try:
-        _download_tar_stream(f"https://codeload.github.com/{owner}/{repo}/tar.gz/{ref_sha}", dst)
-        return
-    except Exception as e:
-        errs.append(f"tar.gz(stream)@sha: {e}")
+def _tar_commit(spool):
     try:
-        _download_tar_stream(f"https://codeload.github.com/{owner}/{repo}/tar.gz/{branch_name}", dst)
-        return
-    except Exception as e:
-        errs.append(f"tar.gz(stream)@branch: {e}")
-    def fetch_bytes(url: str) -> bytes:
-        data = _read(url)
-        if not data: raise RuntimeError("空の応答が返されました。")
-        return data
-    try:
-        data = fetch_bytes(f"https://codeload.github.com/{owner}/{repo}/tar.gz/{ref_sha}")
-        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tf:
-            _extract_tar_to(tf, dst); return
-    except Exception as e: errs.append(f"tar.gz@sha: {e}")
-    try:
-        data = fetch_bytes(f"https://codeload.github.com/{owner}/{repo}/tar.gz/{branch_name}")
-        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tf:
-            _extract_tar_to(tf, dst); return
-    except Exception as e: errs.append(f"tar.gz@branch: {e}")
-    try:
-        data = fetch_bytes(f"https://codeload.github.com/{owner}/{repo}/zip/{ref_sha}")
-        with zipfile.ZipFile(io.BytesIO(data)) as zf:
-            _extract_zip_to(zf, dst); return
-    except Exception as e: errs.append(f"zip@sha: {e}")
-    try:
-        data = fetch_bytes(f"https://codeload.github.com/{owner}/{repo}/zip/{branch_name}")
-        with zipfile.ZipFile(io.BytesIO(data)) as zf:
-            _extract_zip_to(zf, dst); return
-    except Exception as e: errs.append(f"zip@branch: {e}")
+        with tarfile.open(fileobj=_Gunzip(spool), mode="r|") as tf:
+            return tf.pax_headers.get("comment")
+    except Exception:
+        return None
+    finally:
+        spool.seek(0)
+
+def _download_snapshot(dst: Path, owner: str, repo: str, ref_sha: str | None, branch_name: str):
+    errs = []
+    label, ref = ("sha", ref_sha) if ref_sha else ("branch", branch_name)
+    for fmt in ("tar.gz", "zip"):
+        try:
+            with _http(f"https://codeload.github.com/{owner}/{repo}/{fmt}/{ref}") as resp:
+                if fmt == "tar.gz" and int(resp.headers.get("Content-Length") or 0) > SPOOL_MAX:
+                    with _Prefetch(_Gunzip(resp)) as src, tarfile.open(fileobj=src, mode="r|") as tf:
+                        _extract_tar_to(tf, dst)
+                    return
+                spool = _spool(resp)
+            with spool:
+                _extract_spool(spool, dst)
+            return
+        except Exception as e:
+            errs.append(f"{fmt}@{label}: {e}")
     raise RuntimeError("スナップショットのダウンロードに失敗しました: " + "; ".join(errs))
 
 def _write_git_skeleton(dst: Path, remote_url: str, default_branch: str, head_sha: str):
     git = dst / ".git"
-    (git / "refs/heads").mkdir(parents=True, exist_ok=True)
-    (git / "refs/remotes/origin").mkdir(parents=True, exist_ok=True)
-    (git / "refs/remotes/upstream").mkdir(parents=True, exist_ok=True)
-    (git / "objects/info").mkdir(parents=True, exist_ok=True)
-    (git / "HEAD").write_text(f"ref: refs/heads/{default_branch}\n", encoding="utf-8")
-    (git / "refs/heads" / default_branch).write_text(head_sha + "\n", encoding="ascii")
-    (git / "refs/remotes/origin" / default_branch).write_text(head_sha + "\n", encoding="ascii")
-    (git / "refs/remotes/upstream" / default_branch).write_text(head_sha + "\n", encoding="ascii")
+    os.makedirs(git / "refs/heads", exist_ok=True)
+    os.makedirs(git / "refs/remotes/origin", exist_ok=True)
+    os.makedirs(git / "refs/remotes/upstream", exist_ok=True)
+    os.makedirs(git / "objects/info", exist_ok=True)
+    head_line = (head_sha + "\n").encode("ascii")
+    (git / "HEAD").write_bytes(f"ref: refs/heads/{default_branch}\n".encode())
+    (git / "refs/heads" / default_branch).write_bytes(head_line)
+    (git / "refs/remotes/origin" / default_branch).write_bytes(head_line)
+    (git / "refs/remotes/upstream" / default_branch).write_bytes(head_line)
     cfg = f"""
 [core]
 \trepositoryformatversion = 0
@@ -193,32 +409,62 @@ def _write_git_skeleton(dst: Path, remote_url: str, default_branch: str, head_sh
 [extensions]
 \tpartialClone = origin
 """.lstrip()
-    (git / "config").write_text(cfg, encoding="utf-8")
-    (git / "objects/info/promisor").write_text("promisor\n", encoding="utf-8")
+    (git / "config").write_bytes(cfg.encode())
+    (git / "objects/info/promisor").write_bytes(b"promisor\n")
 
-def bootstrap(repo_url: str, dst: Path):
-    print("[blue](i)[/blue] 引数等の問題はありません。開始します...")
-    owner, repo = _owner_repo(repo_url)
-    print(f"[purple](i)[/purple] owner: {owner}, repo: {repo}")
-    token = os.environ.get("GITHUB_TOKEN")
-    default_branch = "master"
-    head_sha = None
+def _resolve_head(owner: str, repo: str, token: str | None):
+    cache = _load_cache()
+    key = f"{owner}/{repo}".lower()
+    cached = cache.get(key)
+    if not isinstance(cached, dict) or not all(isinstance(cached.get(k), str) for k in ("etag", "default_branch", "head_sha")):
+        cached = {}
     try:
-        meta = _json(f"https://api.github.com/repos/{owner}/{repo}", token)
+        meta, etag = _json(f"https://api.github.com/repos/{owner}/{repo}", token, cached.get("etag"))
         default_branch = meta.get("default_branch") or "master"
-        tip = _json(f"https://api.github.com/repos/{owner}/{repo}/commits/{default_branch}", token)
+        tip, _ = _json(f"https://api.github.com/repos/{owner}/{repo}/commits/{default_branch}", token)
         head_sha = tip["sha"]
+        if etag:
+            cache[key] = {"etag": etag, "default_branch": default_branch, "head_sha": head_sha}
+            _save_cache(cache)
         print(f"[purple](i)[/purple] default_branch: {default_branch}, head: {head_sha[:12]}… (APIで取得)")
+    except _NotModified:
+        default_branch, head_sha = cached["default_branch"], cached["head_sha"]
+        print(f"[purple](i)[/purple] default_branch: {default_branch}, head: {head_sha[:12]}… (キャッシュを使用)")
     except Exception:
         print("[yellow](!)[/yellow] API経由でのダウンロード情報の取得に失敗しました。HTMLでの取得を試行します...")
-        b, sha = _guess_default_sha_html(owner, repo)
-        default_branch, head_sha = b, sha
+        default_branch, head_sha = _guess_default_sha_html(owner, repo)
         print(f"[purple](i)[/purple] default_branch: {default_branch}, head: {head_sha[:12]}… (HTMLで取得)")
+    return default_branch, head_sha
 
+def bootstrap(repo_url: str, dst: Path):
+    print("[blue](i)[/blue] 引数等の問題はありません。開始します...")
+    owner, repo = _owner_repo(repo_url)
+    print(f"[purple](i)[/purple] owner: {owner}, repo: {repo}")
+    token = os.environ.get("GITHUB_TOKEN")
     print("[blue](i)[/blue] スナップショットのダウンロードを開始します。")
     t0 = time.time()
-    _download_snapshot(dst, owner, repo, head_sha, default_branch)
-    print(f"[blue](i)[/blue] スナップショットはcodeloadを使用して{time.time()-t0:.1f}秒でダウンロードされました。")
+    abort = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        spec = ex.submit(_fetch_spool, f"https://codeload.github.com/{owner}/{repo}/tar.gz/HEAD", abort)
+        try:
+            default_branch, head_sha = _resolve_head(owner, repo, token)
+        except BaseException:
+            abort.set()
+            raise
+        try:
+            spool = spec.result()
+        except Exception:
+            spool = None
+    spec_sha = _tar_commit(spool) if spool else None
+    if spec_sha and spec_sha.startswith(head_sha):
+        head_sha = spec_sha
+        print("[blue](i)[/blue] 先行ダウンロードしたHEADのスナップショットを使用します。")
+        with spool:
+            _extract_spool(spool, dst)
+    else:
+        if spool: spool.close()
+        _download_snapshot(dst, owner, repo, head_sha, default_branch)
+    print(f"[blue](i)[/blue] スナップショットはcodeloadを使用してダウンロード開始から{time.time()-t0:.1f}秒で展開されました。")
 
     _write_git_skeleton(dst, repo_url, default_branch, head_sha)
     print("[green](✓)[/green] 完了しました。")
@@ -232,12 +478,7 @@ def main():
     if dst.exists():
         if not args.force:
             print(f"[yellow](!)[/yellow] ディレクトリが既に存在しています: {dst}", file=sys.stderr); sys.exit(1)
-        for p in sorted(dst.rglob("*"), reverse=True):
-            try: p.unlink()
-            except IsADirectoryError: pass
-        for p in sorted(dst.rglob("*"), reverse=True):
-            try: p.rmdir()
-            except Exception: pass
+        shutil.rmtree(dst, ignore_errors=True)
     dst.mkdir(parents=True, exist_ok=True)
     try:
         bootstrap(args.url, dst)